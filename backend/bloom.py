@@ -0,0 +1,143 @@
+"""Redis-backed Bloom filters for username/email availability checks."""
+
+import hashlib
+import logging
+import math
+import os
+
+import redis
+from sqlalchemy.orm import Session
+
+from models.user import User
+from oauth.redis_session import get_redis
+
+# Filter sizing from environment
+BLOOM_CAPACITY = int(os.getenv("BLOOM_CAPACITY", 100_000))
+BLOOM_ERROR_RATE = float(os.getenv("BLOOM_ERROR_RATE", 0.01))
+BLOOM_BUILD_TIMEOUT = 600  # seconds a crashed rebuild may hold the building marker
+
+logger = logging.getLogger(__name__)
+
+# Set bits only while the filter is ready or being rebuilt, so an add after a
+# Redis flush can't recreate a bitmap that holds nothing but the new value
+_ADD_SCRIPT = """
+if redis.call('exists', KEYS[2]) == 0 and redis.call('exists', KEYS[3]) == 0 then
+    return 0
+end
+for _, pos in ipairs(ARGV) do
+    redis.call('setbit', KEYS[1], pos, 1)
+end
+return 1
+"""
+
+
+class BloomFilter:
+    """Bloom filter stored as a Redis bitmap, shared by all workers.
+
+    A miss means the value was definitely never added. A hit only means it
+    might have been, so callers must confirm hits against the database.
+    Bits are only ever set, never cleared: deleted values stay as (harmless)
+    false positives, and concurrent rebuilds from several workers can't drop
+    each other's entries.
+
+    Lookups trust the bitmap only once ``load_user_filters`` has finished and
+    written the ready marker. Until then (first start, or after Redis lost its
+    data) every lookup is a possible hit, answered by the database. A Redis
+    restart that restores an older snapshot keeps the marker but can lose
+    recent bits, so rerun the load (restart the app) after one.
+
+    The filter is only an optimization: if Redis errors, lookups report a
+    possible hit and adds are skipped, so callers fall back to the database.
+    A user whose add was skipped is missing until the next load; register
+    is still protected by the unique constraints.
+    """
+
+    def __init__(self, key: str, capacity: int, error_rate: float):
+        self.key = key
+        self.ready_key = f"{key}:ready"
+        self.building_key = f"{key}:building"
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def queue_add(self, pipe, value: str) -> None:
+        """Queue an add that is dropped unless the filter is ready or building."""
+        pipe.eval(_ADD_SCRIPT, 3, self.key, self.ready_key, self.building_key, *self._positions(value))
+
+    def queue_build_add(self, pipe, value: str) -> None:
+        """Queue unconditional bit writes, used while rebuilding."""
+        for pos in self._positions(value):
+            pipe.setbit(self.key, pos, 1)
+
+    def queue_start_build(self, pipe) -> None:
+        pipe.set(self.building_key, 1, ex=BLOOM_BUILD_TIMEOUT)
+
+    def queue_finish_build(self, pipe) -> None:
+        pipe.set(self.ready_key, 1)
+        pipe.delete(self.building_key)
+
+    def add(self, value: str) -> None:
+        pipe = get_redis().pipeline(transaction=False)
+        self.queue_add(pipe, value)
+        try:
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Could not add to Bloom filter %s", self.key, exc_info=True)
+
+    def __contains__(self, value: str) -> bool:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.exists(self.ready_key)
+        for pos in self._positions(value):
+            pipe.getbit(self.key, pos)
+        try:
+            ready, *bits = pipe.execute()
+        except redis.RedisError:
+            logger.warning("Bloom filter %s unavailable, falling back to the database", self.key, exc_info=True)
+            return True
+        return not ready or all(bits)
+
+
+username_filter = BloomFilter("bloom:users:username", BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+email_filter = BloomFilter("bloom:users:email", BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+
+
+def load_user_filters(db: Session, batch_size: int = 1000) -> None:
+    """Add every user in the table to both filters, then mark them ready.
+
+    The building marker is set before the table is read, so users created
+    during the load are still added by ``add_user_to_filters``. Runs at
+    startup; users inserted outside the app (e.g. straight into Postgres)
+    are picked up by the next rebuild.
+    """
+    pipe = get_redis().pipeline(transaction=False)
+    username_filter.queue_start_build(pipe)
+    email_filter.queue_start_build(pipe)
+    pipe.execute()
+
+    for i, (username, email) in enumerate(db.query(User.username, User.email).yield_per(batch_size), 1):
+        username_filter.queue_build_add(pipe, username)
+        email_filter.queue_build_add(pipe, email)
+        if i % batch_size == 0:
+            pipe.execute()
+    pipe.execute()
+
+    username_filter.queue_finish_build(pipe)
+    email_filter.queue_finish_build(pipe)
+    pipe.execute()
+
+
+def add_user_to_filters(username: str, email: str) -> None:
+    """Record a newly created user in both filters with one round trip."""
+    pipe = get_redis().pipeline(transaction=False)
+    username_filter.queue_add(pipe, username)
+    email_filter.queue_add(pipe, email)
+    try:
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("Could not add user %s to Bloom filters", username, exc_info=True)
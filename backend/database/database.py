@@ -4,6 +4,8 @@ from typing import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
+from instrumentation import instrument_engine
+
 # Read DB_USER and DB_PASS from environment variables
 POSTGRES_USER = os.getenv("POSTGRES_USER", "user")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
@@ -11,10 +13,15 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "module6_db")
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 print(f"POSTGRES_USER: {POSTGRES_USER}, POSTGRES_PASSWORD: {POSTGRES_PASSWORD}")
 
-SQLALCHEMY_DATABASE_URL = f'postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}'
+# DATABASE_URL overrides the Postgres settings (e.g. SQLite for tests)
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f'postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}',
+)
 
 # Create engine
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
+instrument_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
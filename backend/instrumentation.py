@@ -0,0 +1,119 @@
+"""Per-request round-trip counting for the database, Redis and outbound HTTP.
+
+Counts are collected two ways:
+
+* per request, via ``QueryCountMiddleware``, which reports them in the
+  ``X-Query-Count`` response header (enabled with ``QUERY_DEBUG=true``);
+* in tests, via ``query_budget``, which fails when a block exceeds its budget:
+
+    with query_budget(db=3, redis=0):
+        client.post("/users/register", json={...})
+
+    @query_budget(db=2)
+    def test_delete_user(): ...
+"""
+
+import os
+import threading
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() == "true"
+QUERY_COUNT_HEADER = "X-Query-Count"
+CALL_KINDS = ("db", "redis", "http")
+
+# Counter for the request currently being handled
+_request_counts: ContextVar[Optional[dict]] = ContextVar("request_counts", default=None)
+
+# Active query_budget blocks (global, since TestClient runs the app in another thread)
+_budgets: list["query_budget"] = []
+_budgets_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block performs more round trips than its budget allows."""
+
+
+def record_call(kind: str) -> None:
+    """Count one round trip of the given kind ('db', 'redis' or 'http')."""
+    counts = _request_counts.get()
+    if counts is not None:
+        counts[kind] += 1
+    # Lock-free fast path: no budget is active outside tests
+    if not _budgets:
+        return
+    with _budgets_lock:
+        for budget in _budgets:
+            budget.counts[kind] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count every statement the engine sends to the database."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        record_call("db")
+
+
+async def count_http_request(request) -> None:
+    """httpx request event hook counting outbound HTTP calls."""
+    record_call("http")
+
+
+HTTP_EVENT_HOOKS = {"request": [count_http_request]}
+
+
+def format_counts(counts: dict) -> str:
+    return ", ".join(f"{kind}={counts[kind]}" for kind in CALL_KINDS)
+
+
+class QueryCountMiddleware(BaseHTTPMiddleware):
+    """Expose per-request round-trip counts in a debug response header."""
+
+    async def dispatch(self, request, call_next):
+        counts = dict.fromkeys(CALL_KINDS, 0)
+        token = _request_counts.set(counts)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_counts.reset(token)
+        response.headers[QUERY_COUNT_HEADER] = format_counts(counts)
+        return response
+
+
+class query_budget(ContextDecorator):
+    """Assert that a block stays within a round-trip budget.
+
+    Each limit is the maximum number of calls of that kind; ``None`` means
+    unlimited. Usable as a context manager or a test decorator.
+    """
+
+    def __init__(self, db: Optional[int] = None, redis: Optional[int] = None, http: Optional[int] = None):
+        self.limits = {"db": db, "redis": redis, "http": http}
+        self.counts = dict.fromkeys(CALL_KINDS, 0)
+
+    def __enter__(self):
+        self.counts = dict.fromkeys(CALL_KINDS, 0)
+        with _budgets_lock:
+            _budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _budgets_lock:
+            _budgets.remove(self)
+        if exc_type is not None:
+            return False
+
+        over = [
+            f"{kind}: {self.counts[kind]} > {limit}"
+            for kind, limit in self.limits.items()
+            if limit is not None and self.counts[kind] > limit
+        ]
+        if over:
+            raise QueryBudgetExceeded(f"Round-trip budget exceeded ({'; '.join(over)})")
+        return False
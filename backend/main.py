@@ -1,17 +1,29 @@
+import logging
 import os
 
+import redis
 from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI
 from routers import users, auth
 
-from database.database import engine, Base
+from bloom import load_user_filters
+from database.database import engine, Base, SessionLocal
+from instrumentation import QUERY_DEBUG, QueryCountMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
 # # Create tables
 Base.metadata.create_all(bind=engine)
 
+# Build the shared availability filters from existing users
+try:
+    with SessionLocal() as db:
+        load_user_filters(db)
+except redis.RedisError:
+    # Filters stay unready, so lookups fall back to the database
+    logging.getLogger(__name__).warning("Could not build availability filters", exc_info=True)
+
 app = FastAPI()
 
 # CORS configuration from environment
@@ -23,6 +35,10 @@ app.add_middleware(
     allow_headers=os.getenv("CORS_HEADERS", "*").split(","),
 )
 
+# Per-request DB/Redis/HTTP round-trip counts in a debug header
+if QUERY_DEBUG:
+    app.add_middleware(QueryCountMiddleware)
+
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 
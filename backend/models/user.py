@@ -37,4 +37,9 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
-    expires_in: int
\ No newline at end of file
+    expires_in: int
+
+
+class AvailabilityResponse(BaseModel):
+    username: bool | None = None
+    email: bool | None = None
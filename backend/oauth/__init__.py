@@ -5,6 +5,7 @@ import base64
 from urllib.parse import urlencode
 import httpx
 
+from instrumentation import HTTP_EVENT_HOOKS
 from .providers import PROVIDERS, OAuthProvider
 
 
@@ -71,7 +72,7 @@ async def exchange_oauth_code_for_token(provider: str | OAuthProvider, code: str
     }
     data.update(cfg.get("token_body_extra", {}))
 
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=HTTP_EVENT_HOOKS) as client:
         response = await client.post(
             cfg["token_url"],
             data=data,
@@ -83,7 +84,7 @@ async def exchange_oauth_code_for_token(provider: str | OAuthProvider, code: str
 async def get_oauth_user_info(provider: str | OAuthProvider, access_token: str) -> dict:
     """Fetch user info from provider API."""
     cfg = _get_provider_config(provider)
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=HTTP_EVENT_HOOKS) as client:
         response = await client.get(
             cfg["user_info_url"],
             headers={"Authorization": f"Bearer {access_token}"},
@@ -97,7 +98,7 @@ async def get_oauth_user_emails(provider: str | OAuthProvider, access_token: str
     emails_url = cfg.get("emails_url")
     if not emails_url:
         return []
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=HTTP_EVENT_HOOKS) as client:
         response = await client.get(
             emails_url,
             headers={"Authorization": f"Bearer {access_token}"},
@@ -6,12 +6,35 @@ import redis
 from typing import Tuple, Optional
 from fastapi import HTTPException
 
+from instrumentation import record_call
+
 # Redis connection settings
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 SESSION_TTL = 600  # 10 minutes (same as cookie max_age)
 
+
+class _CountingPipeline(redis.client.Pipeline):
+    """Pipeline that records each execute() as a single round trip."""
+
+    def execute(self, raise_on_error=True):
+        if self.command_stack:
+            record_call("redis")
+        return super().execute(raise_on_error)
+
+
+class _CountingRedis(redis.Redis):
+    """Redis client that records each command as a round trip."""
+
+    def execute_command(self, *args, **options):
+        record_call("redis")
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _CountingPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
 # Redis client singleton
 _redis_client: Optional[redis.Redis] = None
 
@@ -20,7 +43,7 @@ def get_redis() -> redis.Redis:
     """Get or create Redis client."""
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.Redis(
+        _redis_client = _CountingRedis(
             host=REDIS_HOST,
             port=REDIS_PORT,
             db=REDIS_DB,
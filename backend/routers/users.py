@@ -3,11 +3,21 @@ from typing import List
 import secrets
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import EmailStr
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 
+from bloom import add_user_to_filters, email_filter, username_filter
 from database.database import get_db
-from models.user import User, UserRequest, UserResponse, LoginRequest, TokenResponse
+from models.user import (
+    AvailabilityResponse,
+    User,
+    UserRequest,
+    UserResponse,
+    LoginRequest,
+    TokenResponse,
+)
 from utils import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
@@ -48,13 +58,15 @@ def find_or_create_user(
     fullname: str
 ) -> str:
     """Find existing user or create new one. Returns the username."""
-    existing = db.query(User).filter(
-        (User.username == username) | (User.email == email)
-    ).first()
-    
-    if existing:
-        return existing.username
-    
+    # Only look the user up if either filter reports a possible hit
+    if username in username_filter or email in email_filter:
+        existing = db.query(User).filter(
+            (User.username == username) | (User.email == email)
+        ).first()
+
+        if existing:
+            return existing.username
+
     # Create new user with random password (OAuth users don't use password)
     random_pw = secrets.token_urlsafe(32)
     new_user = User(
@@ -64,15 +76,53 @@ def find_or_create_user(
         hashed_password=hash_password(random_pw),
     )
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Name was inserted outside the app after the filters were built
+        db.rollback()
+        add_user_to_filters(username, email)
+        return db.query(User).filter(
+            (User.username == username) | (User.email == email)
+        ).first().username
     db.refresh(new_user)
+    add_user_to_filters(new_user.username, new_user.email)
     return new_user.username
 
 
+def _username_taken(db: Session, username: str) -> bool:
+    # Bloom miss means definitely free; only a possible hit goes to the DB
+    if username not in username_filter:
+        return False
+    return db.query(User.id).filter(User.username == username).first() is not None
+
+
+def _email_taken(db: Session, email: str) -> bool:
+    if email not in email_filter:
+        return False
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
 @router.get("/", response_model=List[UserResponse])
 def list_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return db.query(User).all()
 
+@router.get("/availability", response_model=AvailabilityResponse)
+def check_availability(
+    username: str | None = None,
+    email: EmailStr | None = None,
+    db: Session = Depends(get_db),
+):
+    """Report whether a username and/or email is still free to register."""
+    if username is None and email is None:
+        raise HTTPException(status_code=400, detail="Provide username or email")
+
+    return AvailabilityResponse(
+        username=None if username is None else not _username_taken(db, username),
+        email=None if email is None else not _email_taken(db, email),
+    )
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(user_id: int, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.id == user_id).first()
@@ -91,6 +141,8 @@ def delete_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # Bloom filters can't drop entries; the freed name stays a possible
+    # hit and is simply confirmed against the DB on the next check
     db.delete(user)
     db.commit()
     return {"message": "User deleted"}
@@ -99,11 +151,11 @@ def delete_user(
 @router.post("/register", response_model=UserResponse)
 def create_user(user_req: UserRequest, db: Session = Depends(get_db)):
     # Check if username exists
-    if db.query(User).filter(User.username == user_req.username).first():
+    if _username_taken(db, user_req.username):
         raise HTTPException(status_code=409, detail="Username already exists")
 
     # Check if email exists
-    if db.query(User).filter(User.email == user_req.email).first():
+    if _email_taken(db, user_req.email):
         raise HTTPException(status_code=409, detail="Email already registered")
 
     # Create and save user
@@ -114,8 +166,17 @@ def create_user(user_req: UserRequest, db: Session = Depends(get_db)):
         hashed_password=hash_password(user_req.password),
     )
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Name was inserted outside the app after the filters were built
+        db.rollback()
+        add_user_to_filters(user_req.username, user_req.email)
+        if _username_taken(db, user_req.username):
+            raise HTTPException(status_code=409, detail="Username already exists")
+        raise HTTPException(status_code=409, detail="Email already registered")
     db.refresh(new_user)
+    add_user_to_filters(new_user.username, new_user.email)
 
     return UserResponse.model_validate(new_user)
 
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Configure the app before anything imports it
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret"
+os.environ["QUERY_DEBUG"] = "true"
+
+import fakeredis
+import pytest
+import redis
+from fastapi.testclient import TestClient
+
+from oauth import redis_session
+
+# In-process Redis, still wrapped in the counting client
+redis_session._redis_client = redis_session._CountingRedis(
+    connection_pool=redis.ConnectionPool(
+        connection_class=fakeredis.FakeRedisConnection,
+        server=fakeredis.FakeServer(),
+    )
+)
+
+from bloom import load_user_filters
+from database.database import Base, SessionLocal, engine
+from main import app
+
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    redis_session.get_redis().flushall()
+    with SessionLocal() as db:
+        load_user_filters(db)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register_user(client):
+    def _register(username="alice", email="alice@example.com", password="secret"):
+        response = client.post(
+            "/users/register",
+            json={"username": username, "email": email, "fullname": "Test User", "password": password},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return _register
+
+
+@pytest.fixture
+def auth_headers(client, register_user):
+    register_user(username="admin", email="admin@example.com", password="secret")
+    response = client.post("/users/login", json={"username_or_email": "admin", "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
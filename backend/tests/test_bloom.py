@@ -0,0 +1,65 @@
+import pytest
+
+from bloom import BloomFilter
+from oauth.redis_session import get_redis
+
+
+@pytest.fixture
+def bloom_filter():
+    bloom = BloomFilter("bloom:test", capacity=1000, error_rate=0.01)
+    keys = (bloom.key, bloom.ready_key, bloom.building_key)
+    get_redis().delete(*keys)
+    pipe = get_redis().pipeline(transaction=False)
+    bloom.queue_start_build(pipe)
+    bloom.queue_finish_build(pipe)
+    pipe.execute()
+    yield bloom
+    get_redis().delete(*keys)
+
+
+def test_added_values_are_always_present(bloom_filter):
+    values = [f"user{i}" for i in range(1000)]
+    for value in values:
+        bloom_filter.add(value)
+
+    assert all(value in bloom_filter for value in values)
+
+
+def test_false_positive_rate_at_capacity(bloom_filter):
+    for i in range(1000):
+        bloom_filter.add(f"user{i}")
+
+    probes = 10_000
+    false_positives = sum(f"other{i}" in bloom_filter for i in range(probes))
+
+    assert false_positives / probes < 0.02
+
+
+def test_missing_ready_marker_is_a_possible_hit(bloom_filter):
+    get_redis().delete(bloom_filter.ready_key)
+
+    assert "anything" in bloom_filter
+
+
+def test_add_after_flush_does_not_recreate_bitmap(bloom_filter):
+    bloom_filter.add("bob")
+    get_redis().flushall()
+
+    bloom_filter.add("carol")
+
+    assert not get_redis().exists(bloom_filter.key)
+    assert "bob" in bloom_filter
+
+
+def test_add_during_rebuild_is_kept(bloom_filter):
+    get_redis().delete(bloom_filter.key, bloom_filter.ready_key)
+    pipe = get_redis().pipeline(transaction=False)
+    bloom_filter.queue_start_build(pipe)
+    pipe.execute()
+
+    bloom_filter.add("carol")
+    bloom_filter.queue_finish_build(pipe)
+    pipe.execute()
+
+    assert "carol" in bloom_filter
+    assert "bob" not in bloom_filter
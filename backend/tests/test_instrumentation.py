@@ -0,0 +1,55 @@
+import pytest
+
+from instrumentation import QUERY_COUNT_HEADER, QueryBudgetExceeded, query_budget, record_call
+
+
+def test_query_budget_passes_within_budget():
+    with query_budget(db=2, redis=1) as budget:
+        record_call("db")
+        record_call("db")
+        record_call("redis")
+
+    assert budget.counts == {"db": 2, "redis": 1, "http": 0}
+
+
+def test_query_budget_raises_when_over_budget():
+    with pytest.raises(QueryBudgetExceeded, match=r"db: 3 > 2"):
+        with query_budget(db=2):
+            for _ in range(3):
+                record_call("db")
+
+
+def test_query_budget_ignores_unlimited_kinds():
+    with query_budget(db=0):
+        record_call("redis")
+        record_call("http")
+
+
+def test_query_budget_as_decorator():
+    @query_budget(http=1)
+    def fetch_twice():
+        record_call("http")
+        record_call("http")
+
+    @query_budget(http=1)
+    def fetch_once():
+        record_call("http")
+
+    fetch_once()
+    with pytest.raises(QueryBudgetExceeded):
+        fetch_twice()
+
+
+def test_query_budget_does_not_mask_errors():
+    with pytest.raises(ValueError):
+        with query_budget(db=0):
+            record_call("db")
+            raise ValueError("boom")
+
+
+def test_query_count_header(client, register_user):
+    user = register_user()
+
+    response = client.get(f"/users/{user['id']}")
+
+    assert response.headers[QUERY_COUNT_HEADER] == "db=1, redis=0, http=0"
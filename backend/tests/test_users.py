@@ -0,0 +1,166 @@
+import pytest
+import redis
+
+import bloom
+from database.database import SessionLocal
+from instrumentation import query_budget
+from models.user import User
+from oauth.redis_session import get_redis
+from routers.users import find_or_create_user
+
+
+def test_register_query_budget(client):
+    # Fresh names miss both Bloom filters: INSERT + reload only
+    with query_budget(db=2, redis=3):
+        response = client.post(
+            "/users/register",
+            json={"username": "bob", "email": "bob@example.com", "password": "secret"},
+        )
+    assert response.status_code == 200
+
+
+def test_register_taken_username_query_budget(client, register_user):
+    register_user(username="bob")
+
+    with query_budget(db=1):
+        response = client.post(
+            "/users/register",
+            json={"username": "bob", "email": "other@example.com", "password": "secret"},
+        )
+    assert response.status_code == 409
+
+
+def test_delete_user_query_budget(client, auth_headers, register_user):
+    user = register_user(username="bob", email="bob@example.com")
+
+    # Auth lookup + the handler's SELECT and DELETE
+    with query_budget(db=3, redis=0):
+        response = client.delete(f"/users/{user['id']}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_availability_query_budget(client, register_user):
+    register_user(username="bob", email="bob@example.com")
+
+    # A filter miss is answered from Redis alone
+    with query_budget(db=0, redis=1):
+        response = client.get("/users/availability", params={"username": "nobody"})
+    assert response.status_code == 200
+    assert response.json()["username"] is True
+
+    # A possible hit is confirmed with one query
+    with query_budget(db=1, redis=1):
+        response = client.get("/users/availability", params={"username": "bob"})
+    assert response.status_code == 200
+    assert response.json()["username"] is False
+
+
+def test_availability_requires_a_parameter(client):
+    response = client.get("/users/availability")
+
+    assert response.status_code == 400
+
+
+def test_availability_free_and_taken(client, register_user):
+    register_user(username="bob", email="bob@example.com")
+
+    response = client.get("/users/availability", params={"username": "bob", "email": "new@example.com"})
+    assert response.json() == {"username": False, "email": True}
+
+    response = client.get("/users/availability", params={"username": "carol", "email": "bob@example.com"})
+    assert response.json() == {"username": True, "email": False}
+
+
+def test_availability_normalizes_email(client, register_user):
+    register_user(username="bob", email="bob@Example.COM")
+
+    response = client.get("/users/availability", params={"email": "bob@example.com"})
+    assert response.json()["email"] is False
+
+    response = client.get("/users/availability", params={"email": "bob@EXAMPLE.com"})
+    assert response.json()["email"] is False
+
+
+def test_availability_after_delete(client, auth_headers, register_user):
+    user = register_user(username="bob", email="bob@example.com")
+    client.delete(f"/users/{user['id']}", headers=auth_headers)
+
+    # Still a filter hit, so the DB confirms the name is free again
+    with query_budget() as budget:
+        response = client.get("/users/availability", params={"username": "bob"})
+
+    assert response.json()["username"] is True
+    assert budget.counts["db"] == 1
+
+
+def test_availability_after_redis_flush(client, register_user):
+    register_user(username="bob", email="bob@example.com")
+    get_redis().flushall()
+    register_user(username="carol", email="carol@example.com")
+
+    response = client.get("/users/availability", params={"username": "bob", "email": "bob@example.com"})
+
+    assert response.json() == {"username": False, "email": False}
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    unreachable = redis.Redis(host="localhost", port=1, socket_connect_timeout=0.1)
+    monkeypatch.setattr(bloom, "get_redis", lambda: unreachable)
+
+
+def test_register_and_availability_without_redis(client, register_user, redis_down):
+    user = register_user(username="bob", email="bob@example.com")
+    assert user["username"] == "bob"
+
+    response = client.get("/users/availability", params={"username": "bob", "email": "new@example.com"})
+    assert response.status_code == 200
+    assert response.json() == {"username": False, "email": True}
+
+    response = client.post(
+        "/users/register",
+        json={"username": "bob", "email": "other@example.com", "password": "secret"},
+    )
+    assert response.status_code == 409
+
+
+def test_find_or_create_user_without_redis(client, redis_down):
+    with SessionLocal() as db:
+        assert find_or_create_user(db, "bob", "bob@example.com", "Bob") == "bob"
+        assert find_or_create_user(db, "bob", "bob@example.com", "Bob") == "bob"
+
+
+@pytest.fixture
+def unfiltered_user(client):
+    # Inserted straight into the DB, so the Bloom filters never saw it
+    with SessionLocal() as db:
+        db.add(User(username="bob", email="bob@example.com", hashed_password="x"))
+        db.commit()
+    assert "bob" not in bloom.username_filter
+    assert "bob@example.com" not in bloom.email_filter
+
+
+def test_register_username_clash_behind_filter(client, unfiltered_user):
+    response = client.post(
+        "/users/register",
+        json={"username": "bob", "email": "new@example.com", "password": "secret"},
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Username already exists"
+
+
+def test_register_email_clash_behind_filter(client, unfiltered_user):
+    response = client.post(
+        "/users/register",
+        json={"username": "carol", "email": "bob@example.com", "password": "secret"},
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Email already registered"
+
+
+def test_find_or_create_user_clash_behind_filter(client, unfiltered_user):
+    with SessionLocal() as db:
+        assert find_or_create_user(db, "bobby", "bob@example.com", "Bob") == "bob"
+        assert db.query(User).count() == 1
@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { useRef, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
@@ -10,8 +10,32 @@ export default function Register() {
   const [password, setPassword] = useState('')
   const [error, setError] = useState('')
   const [success, setSuccess] = useState(false)
+  const [availability, setAvailability] = useState({})
+  const availabilityRequests = useRef({})
   const navigate = useNavigate()
 
+  // Bumping the request id makes any in-flight check for the field stale
+  const resetAvailability = (field) => {
+    availabilityRequests.current[field] = (availabilityRequests.current[field] || 0) + 1
+    setAvailability((prev) => ({ ...prev, [field]: undefined }))
+    return availabilityRequests.current[field]
+  }
+
+  const checkAvailability = async (field, value) => {
+    const requestId = resetAvailability(field)
+    if (!value) return
+    try {
+      const params = new URLSearchParams({ [field]: value })
+      const res = await fetch(`${API_URL}/users/availability?${params}`)
+      if (!res.ok) return
+      const data = await res.json()
+      if (availabilityRequests.current[field] !== requestId) return
+      setAvailability((prev) => ({ ...prev, [field]: data[field] }))
+    } catch {
+      // Availability is only a hint; the register call still validates
+    }
+  }
+
   const handleSubmit = async (e) => {
     e.preventDefault()
     setError('')
@@ -50,20 +74,30 @@ export default function Register() {
           <input
             type="text"
             value={username}
-            onChange={(e) => setUsername(e.target.value)}
+            onChange={(e) => {
+              setUsername(e.target.value)
+              resetAvailability('username')
+            }}
+            onBlur={() => checkAvailability('username', username)}
             required
             style={{ width: '100%', padding: '0.5rem', fontSize: '1rem' }}
           />
+          {availability.username === false && <p style={{ color: 'red', margin: '0.25rem 0 0' }}>Username already taken</p>}
         </div>
         <div>
           <label style={{ display: 'block', marginBottom: '0.5rem' }}>Email</label>
           <input
             type="email"
             value={email}
-            onChange={(e) => setEmail(e.target.value)}
+            onChange={(e) => {
+              setEmail(e.target.value)
+              resetAvailability('email')
+            }}
+            onBlur={() => checkAvailability('email', email)}
             required
             style={{ width: '100%', padding: '0.5rem', fontSize: '1rem' }}
           />
+          {availability.email === false && <p style={{ color: 'red', margin: '0.25rem 0 0' }}>Email already registered</p>}
         </div>
         <div>
           <label style={{ display: 'block', marginBottom: '0.5rem' }}>Full Name</label>